@@ -1,11 +1,14 @@
 # Core modules
-from .mem0_client import Mem0ClientWrapper, get_client
+from .mem0_client import Mem0ClientWrapper, get_client, close_client
 from .config import Config, get_config, reset_config
+from .cache import TTLCache
 
 __all__ = [
     "Mem0ClientWrapper",
     "get_client",
+    "close_client",
     "Config",
     "get_config",
-    "reset_config"
+    "reset_config",
+    "TTLCache"
 ]
\ No newline at end of file
@@ -9,6 +9,10 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Accepted values for validated settings
+VALID_MODES = frozenset({"basic", "full"})
+VALID_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+
 
 @dataclass
 class Config:
@@ -107,12 +111,11 @@ class Config:
             errors.append(f"Invalid port: {self.port}")
         
         # Validate mode
-        if self.mode not in ("basic", "full"):
+        if self.mode not in VALID_MODES:
             errors.append(f"Invalid mode: {self.mode}")
         
         # Validate log level
-        valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-        if self.log_level.upper() not in valid_levels:
+        if self.log_level.upper() not in VALID_LOG_LEVELS:
             errors.append(f"Invalid log level: {self.log_level}")
         
         return errors
@@ -1,52 +1,194 @@
 """
 Centralized mem0 client wrapper with retry logic and error handling
 """
+import os
 import time
+import hashlib
+import itertools
+import random
+import asyncio
 import logging
 from typing import Optional, List, Dict, Any, Callable
+import httpx
 from mem0 import MemoryClient
 from dotenv import load_dotenv
 
+from .cache import TTLCache
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Retry policy for mem0 API calls
+MAX_RETRIES = max(1, int(os.getenv("MEM0_MAX_RETRIES", "3")))
+RETRY_MAX_DELAY = max(0.0, float(os.getenv("MEM0_RETRY_MAX_DELAY", "10")))
+
+# Connection pool shared by all requests to the mem0 API
+HTTP_POOL_SIZE = 32
+HTTP_KEEPALIVE_EXPIRY = 60.0
+HTTP_CONNECT_RETRIES = 3
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_TIMEOUT = 300.0
+
+# Search results are reused for identical queries until they expire or a write happens.
+# mem0 processes adds in the background, so a lookup right after an add can still
+# miss the new memory; the short lifetime bounds how long such a result is reused.
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 30.0
+
+# Memory listings are reused the same way
+LISTING_CACHE_SIZE = 16
+LISTING_CACHE_TTL = 30.0
+
+# Digest of the last custom instructions pushed to the mem0 project
+INSTRUCTIONS_HASH_FILE = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+    "mem0-mcp",
+    "instructions.hash"
+)
+
 
 class Mem0ClientWrapper:
     """Wrapper for mem0 client with retry logic and enhanced functionality"""
     
     def __init__(self, api_key: Optional[str] = None):
         """Initialize mem0 client with optional API key"""
-        self.client = MemoryClient(api_key=api_key) if api_key else MemoryClient()
+        # Reuse keep-alive connections instead of paying TCP/TLS setup per call,
+        # and retry failed connects at the transport level (safe for non-idempotent adds)
+        self.http_client = httpx.Client(
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            transport=httpx.HTTPTransport(
+                retries=HTTP_CONNECT_RETRIES,
+                limits=httpx.Limits(
+                    max_connections=HTTP_POOL_SIZE,
+                    max_keepalive_connections=HTTP_POOL_SIZE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                )
+            )
+        )
+        try:
+            self.client = MemoryClient(api_key=api_key, client=self.http_client)
+        except Exception:
+            self.http_client.close()
+            raise
         self.default_user_id = "cursor_mcp"
+        self.search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+        self.listing_cache = TTLCache(maxsize=LISTING_CACHE_SIZE, ttl=LISTING_CACHE_TTL)
+        # Bumped on every write, so lookups that raced with one don't cache their results
+        self._write_generation = 0
+        self._instructions_hash: Optional[str] = None
         
-    def retry_operation(self, func: Callable, max_retries: int = 3, retry_delay: float = 1.0) -> Any:
+    def retry_operation(self, func: Callable, max_retries: int = MAX_RETRIES, retry_delay: float = 1.0,
+                        max_delay: float = RETRY_MAX_DELAY) -> Any:
         """
-        Retry an operation with exponential backoff
+        Retry an operation with jittered exponential backoff
+        
+        Errors that cannot succeed on a retry, such as invalid arguments or
+        client-side HTTP errors, are raised immediately.
         
         Args:
             func: Function to execute
             max_retries: Maximum number of retry attempts
             retry_delay: Initial delay between retries (doubles each time)
+            max_delay: Upper bound for a single delay
             
         Returns:
             Result of the function or raises the last exception
         """
-        last_exception = None
-        
-        for attempt in range(max_retries):
+        for attempt in itertools.count():
             try:
                 return func()
             except Exception as e:
-                last_exception = e
-                if attempt < max_retries - 1:
-                    wait_time = retry_delay * (2 ** attempt)
-                    logger.warning(f"Operation failed (attempt {attempt + 1}/{max_retries}): {str(e)}. Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"Operation failed after {max_retries} attempts: {str(e)}")
+                time.sleep(self._next_retry_delay(e, attempt, max_retries, retry_delay, max_delay))
+    
+    async def aretry_operation(self, func: Callable, max_retries: int = MAX_RETRIES, retry_delay: float = 1.0,
+                               max_delay: float = RETRY_MAX_DELAY) -> Any:
+        """
+        Async variant of retry_operation
+        
+        Each attempt runs in a worker thread and the backoff waits on the event
+        loop, so no thread is held while sleeping between attempts.
+        
+        Args:
+            func: Function to execute
+            max_retries: Maximum number of retry attempts
+            retry_delay: Initial delay between retries (doubles each time)
+            max_delay: Upper bound for a single delay
+            
+        Returns:
+            Result of the function or raises the last exception
+        """
+        for attempt in itertools.count():
+            try:
+                return await asyncio.to_thread(func)
+            except Exception as e:
+                await asyncio.sleep(self._next_retry_delay(e, attempt, max_retries, retry_delay, max_delay))
+    
+    def _next_retry_delay(self, error: Exception, attempt: int, max_retries: int, retry_delay: float,
+                          max_delay: float) -> float:
+        """
+        Decide what follows a failed attempt
+        
+        Returns the delay before the next attempt, or re-raises the error when
+        it is not retriable or the attempts are used up.
+        """
+        if not self._is_retriable(error):
+            logger.error("Operation failed with a non-retriable error: %s", error)
+            raise error
+        if attempt >= max_retries - 1:
+            logger.error("Operation failed after %d attempts: %s", attempt + 1, error)
+            raise error
+        
+        wait_time = self._backoff_delay(attempt, retry_delay, max_delay)
+        logger.warning("Operation failed (attempt %d/%d): %s. Retrying in %.2fs...", attempt + 1, max_retries, error, wait_time)
+        return wait_time
+    
+    @staticmethod
+    def _is_retriable(error: Exception) -> bool:
+        """Whether an error may succeed when the operation is retried"""
+        if isinstance(error, (ValueError, TypeError)):
+            return False
         
-        raise last_exception
+        status_code = Mem0ClientWrapper._status_code(error)
+        if status_code is not None and 400 <= status_code < 500:
+            # Timeouts and rate limits clear up; other client errors won't
+            return status_code in (408, 429)
+        return True
+    
+    @staticmethod
+    def _status_code(error: Exception) -> Optional[int]:
+        """
+        HTTP status behind an error, if any
+        
+        mem0 wraps the httpx error in its own exception: 0.1.x keeps the
+        original as the exception context, 1.x and later record the status
+        in debug_info.
+        """
+        seen = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            response = getattr(error, "response", None)
+            debug_info = getattr(error, "debug_info", None)
+            for status_code in (
+                getattr(response, "status_code", None),
+                getattr(error, "status_code", None),
+                debug_info.get("status_code") if isinstance(debug_info, dict) else None,
+            ):
+                if isinstance(status_code, int):
+                    return status_code
+            error = error.__cause__ or error.__context__
+        return None
+    
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_delay: float, max_delay: float) -> float:
+        """
+        Delay before the next attempt
+        
+        The second half of the delay is randomized so concurrent callers hitting
+        a rate limit don't retry in lockstep.
+        """
+        backoff = min(max_delay, retry_delay * (2 ** attempt))
+        return backoff / 2 + random.uniform(0, backoff / 2)
     
     def add_memory(self, content: str, user_id: Optional[str] = None, metadata: Optional[Dict] = None) -> Dict[str, Any]:
         """
@@ -60,6 +202,19 @@ class Mem0ClientWrapper:
         Returns:
             Response from mem0 API
         """
+        result = self.retry_operation(self._add_call(content, user_id, metadata))
+        self.invalidate_caches()
+        return result
+    
+    async def aadd_memory(self, content: str, user_id: Optional[str] = None,
+                          metadata: Optional[Dict] = None) -> Dict[str, Any]:
+        """Async variant of add_memory"""
+        result = await self.aretry_operation(self._add_call(content, user_id, metadata))
+        self.invalidate_caches()
+        return result
+    
+    def _add_call(self, content: str, user_id: Optional[str], metadata: Optional[Dict]) -> Callable:
+        """Build the API call that adds a memory"""
         user_id = user_id or self.default_user_id
         
         def _add():
@@ -69,12 +224,15 @@ class Mem0ClientWrapper:
                 params["metadata"] = metadata
             return self.client.add(messages, **params)
         
-        return self.retry_operation(_add)
+        return _add
     
     def search_memories(self, query: str, user_id: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
         """
         Search memories with retry logic
         
+        Identical queries (ignoring case and whitespace) are answered from
+        the search cache until it expires or memories change.
+        
         Args:
             query: Search query
             user_id: User ID (defaults to self.default_user_id)
@@ -84,17 +242,48 @@ class Mem0ClientWrapper:
             List of matching memories
         """
         user_id = user_id or self.default_user_id
+        cache_key = self._search_cache_key(query, user_id, limit)
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        generation = self._write_generation
+        results = self.retry_operation(self._search_call(query, user_id, limit)).get("results", [])
+        self._cache_result(self.search_cache, cache_key, results, generation)
+        return results
+    
+    async def asearch_memories(self, query: str, user_id: Optional[str] = None,
+                               limit: int = 20) -> List[Dict[str, Any]]:
+        """Async variant of search_memories"""
+        user_id = user_id or self.default_user_id
+        cache_key = self._search_cache_key(query, user_id, limit)
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
+        generation = self._write_generation
+        results = (await self.aretry_operation(self._search_call(query, user_id, limit))).get("results", [])
+        self._cache_result(self.search_cache, cache_key, results, generation)
+        return results
+    
+    def _search_call(self, query: str, user_id: str, limit: int) -> Callable:
+        """Build the API call that searches memories"""
         def _search():
             return self.client.search(query, user_id=user_id, limit=limit, output_format="v1.1")
         
-        results = self.retry_operation(_search)
-        return results.get("results", [])
+        return _search
+    
+    @staticmethod
+    def _search_cache_key(query: str, user_id: str, limit: int) -> tuple:
+        """Cache key for a search, ignoring case and whitespace differences"""
+        return (user_id, " ".join(query.lower().split()), limit)
     
-    def get_all_memories(self, user_id: Optional[str] = None, page: int = 1, page_size: int = 50) -> List[Dict[str, Any]]:
+    def get_all_memories(self, user_id: Optional[str] = None, page: int = 1, page_size: int = 100) -> List[Dict[str, Any]]:
         """
         Get all memories with retry logic
         
+        Pages are served from the listing cache until it expires or memories change.
+        
         Args:
             user_id: User ID (defaults to self.default_user_id)
             page: Page number
@@ -103,13 +292,49 @@ class Mem0ClientWrapper:
         Returns:
             List of all memories
         """
-        user_id = user_id or self.default_user_id
+        return self.get_memories_page(user_id, page, page_size).get("results", [])
+    
+    def get_memories_page(self, user_id: Optional[str] = None, page: int = 1,
+                          page_size: int = 100) -> Dict[str, Any]:
+        """
+        Get one page of memories as the whole page response
         
+        Args:
+            user_id: User ID (defaults to self.default_user_id)
+            page: Page number
+            page_size: Number of items per page
+            
+        Returns:
+            Page response from mem0 API, with the memories under "results" and
+            the total number of memories under "count"
+        """
+        user_id = user_id or self.default_user_id
+        cache_key = ("page", user_id, page, page_size)
+        response = self.listing_cache.get(cache_key)
+        if response is None:
+            generation = self._write_generation
+            response = self.retry_operation(self._page_call(user_id, page, page_size))
+            self._cache_result(self.listing_cache, cache_key, response, generation)
+        return response
+    
+    async def aget_memories_page(self, user_id: Optional[str] = None, page: int = 1,
+                                 page_size: int = 100) -> Dict[str, Any]:
+        """Async variant of get_memories_page"""
+        user_id = user_id or self.default_user_id
+        cache_key = ("page", user_id, page, page_size)
+        response = self.listing_cache.get(cache_key)
+        if response is None:
+            generation = self._write_generation
+            response = await self.aretry_operation(self._page_call(user_id, page, page_size))
+            self._cache_result(self.listing_cache, cache_key, response, generation)
+        return response
+    
+    def _page_call(self, user_id: str, page: int, page_size: int) -> Callable:
+        """Build the API call that fetches one page of memories"""
         def _get_all():
             return self.client.get_all(user_id=user_id, page=page, page_size=page_size)
         
-        results = self.retry_operation(_get_all)
-        return results.get("results", [])
+        return _get_all
     
     def update_memory(self, memory_id: str, content: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -128,7 +353,9 @@ class Mem0ClientWrapper:
         def _update():
             return self.client.update(memory_id, content, user_id=user_id)
         
-        return self.retry_operation(_update)
+        result = self.retry_operation(_update)
+        self.invalidate_caches()
+        return result
     
     def delete_memory(self, memory_id: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -146,7 +373,9 @@ class Mem0ClientWrapper:
         def _delete():
             return self.client.delete(memory_id, user_id=user_id)
         
-        return self.retry_operation(_delete)
+        result = self.retry_operation(_delete)
+        self.invalidate_caches()
+        return result
     
     def get_memory_by_id(self, memory_id: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
@@ -167,23 +396,70 @@ class Mem0ClientWrapper:
         try:
             return self.retry_operation(_get)
         except Exception as e:
-            logger.error(f"Failed to get memory {memory_id}: {e}")
+            logger.error("Failed to get memory %s: %s", memory_id, e)
             return None
     
-    def update_project_instructions(self, instructions: str) -> Dict[str, Any]:
+    def invalidate_caches(self) -> None:
+        """Drop cached searches and listings after memories change"""
+        self._write_generation += 1
+        self.search_cache.clear()
+        self.listing_cache.clear()
+    
+    def _cache_result(self, cache: TTLCache, key: tuple, value: Any, generation: int) -> None:
+        """Cache a lookup result, unless a write happened since the lookup started"""
+        if generation == self._write_generation:
+            cache.set(key, value)
+    
+    def close(self) -> None:
+        """Close pooled connections to the mem0 API"""
+        self.http_client.close()
+    
+    def update_project_instructions(self, instructions: str) -> Optional[Dict[str, Any]]:
         """
         Update project custom instructions
         
+        The update is skipped when the same instructions were already applied
+        to this project, so restarts don't repeat the API call.
+        
         Args:
             instructions: Custom instructions for the project
             
         Returns:
-            Response from mem0 API
+            Response from mem0 API, or None if the update was skipped
         """
+        api_key = getattr(self.client, "api_key", "") or ""
+        digest = hashlib.sha256(f"{api_key}\n{instructions}".encode()).hexdigest()
+        if digest == self._instructions_hash or digest == self._read_instructions_hash():
+            self._instructions_hash = digest
+            logger.info("Custom instructions unchanged, skipping project update")
+            return None
+        
         def _update():
             return self.client.update_project(custom_instructions=instructions)
         
-        return self.retry_operation(_update)
+        result = self.retry_operation(_update)
+        self._instructions_hash = digest
+        self._write_instructions_hash(digest)
+        return result
+    
+    @staticmethod
+    def _read_instructions_hash() -> Optional[str]:
+        """Read the digest of the last applied instructions, if any"""
+        try:
+            with open(INSTRUCTIONS_HASH_FILE) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _write_instructions_hash(digest: str) -> None:
+        """Remember the digest of the applied instructions"""
+        try:
+            os.makedirs(os.path.dirname(INSTRUCTIONS_HASH_FILE), exist_ok=True)
+            with open(INSTRUCTIONS_HASH_FILE, "w") as f:
+                f.write(digest)
+        except OSError as e:
+            logger.warning("Could not store instructions hash: %s", e)
 
 
 # Global instance for convenience
@@ -195,4 +471,12 @@ def get_client() -> Mem0ClientWrapper:
     global _client_instance
     if _client_instance is None:
         _client_instance = Mem0ClientWrapper()
-    return _client_instance
\ No newline at end of file
+    return _client_instance
+
+
+def close_client() -> None:
+    """Close and drop the global mem0 client instance, if one was created"""
+    global _client_instance
+    if _client_instance is not None:
+        _client_instance.close()
+        _client_instance = None
\ No newline at end of file
@@ -44,6 +44,14 @@ def main():
                         help='Enable debug mode')
     parser.add_argument('--no-instructions', action='store_true',
                         help='Disable custom instructions')
+    parser.add_argument('--limit-concurrency', type=int, default=None,
+                        help='Maximum concurrent connections before returning 503 '
+                             '(default: from LIMIT_CONCURRENCY env or unlimited)')
+    parser.add_argument('--backlog', type=int, default=None,
+                        help='Maximum number of pending connections (default: from BACKLOG env or 2048)')
+    parser.add_argument('--timeout-keep-alive', type=int, default=None,
+                        help='Seconds to keep idle HTTP connections open '
+                             '(default: from TIMEOUT_KEEP_ALIVE env or 75)')
     
     args = parser.parse_args()
     
@@ -51,6 +59,14 @@ def main():
     if args.port is None:
         args.port = int(os.environ.get('PORT', 8080))
     
+    # Determine connection tuning
+    if args.limit_concurrency is None and os.environ.get('LIMIT_CONCURRENCY'):
+        args.limit_concurrency = int(os.environ['LIMIT_CONCURRENCY'])
+    if args.backlog is None:
+        args.backlog = int(os.environ.get('BACKLOG', 2048))
+    if args.timeout_keep_alive is None:
+        args.timeout_keep_alive = int(os.environ.get('TIMEOUT_KEEP_ALIVE', 75))
+    
     # Set custom instructions
     custom_instructions = None if args.no_instructions else DEFAULT_INSTRUCTIONS
     
@@ -78,13 +94,17 @@ def main():
     print(f"🛠️  Tools Enabled: {len(mcp._tool_manager._tools)}")
     print("="*50 + "\n")
     
-    # Run server
+    # Run server in a single process: SSE sessions live in this process's memory
     uvicorn.run(
         app,
         host=args.host,
         port=args.port,
+        limit_concurrency=args.limit_concurrency,
+        backlog=args.backlog,
+        timeout_keep_alive=args.timeout_keep_alive,
         log_level="debug" if args.debug else "info",
-        access_log=True
+        # Per-request access logging is only worth its cost while debugging
+        access_log=args.debug
     )
 
 
@@ -2,6 +2,7 @@
 Server factory for creating MCP server - Simplified
 """
 import os
+import time
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
@@ -15,10 +16,32 @@ from starlette.routing import Route, Mount
 import json
 
 from ..tools import MemoryTools
-from ..core import get_client
+from ..core import get_client, close_client
 
 logger = logging.getLogger(__name__)
 
+# Static parts of the health check response
+HEALTH_STATUS = {"status": "healthy", "service": "mem0-mcp"}
+
+# Only the health check is readable cross-origin; the MCP endpoints are not
+HEALTH_HEADERS = {"Access-Control-Allow-Origin": "*"}
+
+# Fixed response bodies, already encoded so Starlette sends them as-is
+NOT_FOUND_BODY = b"Not found"
+
+# (unix second, encoded body) of the last health check response
+_last_health_body = (0, b"")
+
+
+def _health_body() -> bytes:
+    """Health check JSON, serialized and encoded at most once per second"""
+    global _last_health_body
+    now = int(time.time())
+    if _last_health_body[0] != now:
+        timestamp = datetime.fromtimestamp(now).isoformat()
+        _last_health_body = (now, json.dumps({**HEALTH_STATUS, "timestamp": timestamp}).encode())
+    return _last_health_body[1]
+
 
 class ServerFactory:
     """Factory for creating MCP server"""
@@ -41,8 +64,9 @@ class ServerFactory:
         # Initialize FastMCP server
         mcp = FastMCP(name)
         
-        # Initialize mem0 client with custom instructions
-        if custom_instructions:
+        # Initialize mem0 client with custom instructions, unless the project
+        # is managed elsewhere (tests, import-only tooling)
+        if custom_instructions and os.getenv("MEM0_SKIP_PROJECT_INIT") != "1":
             client = get_client()
             client.update_project_instructions(custom_instructions)
         
@@ -65,11 +89,11 @@ class ServerFactory:
             return await tools.search_memories(query)
         
         @mcp.tool(
-            description="""Retrieve all stored memories for the user. Returns a comprehensive list of all stored 
-            information."""
+            description="""Retrieve stored memories for the user, one page at a time (page_size up to 100). 
+            Returns {"memories": [...], "next_page": n}; next_page is null on the last page."""
         )
-        async def get_all_memories() -> str:
-            return await tools.get_all_memories()
+        async def get_all_memories(page: int = 1, page_size: int = 100) -> str:
+            return await tools.get_all_memories(page, page_size)
         
         logger.info(f"Created MCP server '{name}' with {len(mcp._tool_manager._tools)} tools")
         return mcp
@@ -78,15 +102,23 @@ class ServerFactory:
     async def health_check(request: Request) -> Response:
         """Health check endpoint"""
         return Response(
-            content=json.dumps({
-                "status": "healthy",
-                "service": "mem0-mcp",
-                "timestamp": datetime.now().isoformat()
-            }),
+            content=_health_body(),
             media_type="application/json",
-            headers={"Access-Control-Allow-Origin": "*"}
+            headers=HEALTH_HEADERS
         )
     
+    @staticmethod
+    async def handle_lifespan(receive, send) -> None:
+        """Handle ASGI lifespan events, releasing pooled mem0 connections on shutdown"""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                close_client()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    
     @staticmethod
     def create_starlette_app(
         mcp_server: Server,
@@ -108,6 +140,10 @@ class ServerFactory:
         # Create the ASGI app for SSE
         async def sse_app(scope, receive, send):
             """ASGI app that handles both SSE and message endpoints"""
+            if scope["type"] == "lifespan":
+                await ServerFactory.handle_lifespan(receive, send)
+                return
+            
             path = scope.get("path", "")
             
             if path == "/sse" and scope["method"] == "GET":
@@ -127,7 +163,7 @@ class ServerFactory:
                 await response(scope, receive, send)
             else:
                 # 404 for unknown paths
-                response = Response("Not found", status_code=404)
+                response = Response(NOT_FOUND_BODY, status_code=404)
                 await response(scope, receive, send)
         
         # Return the app directly
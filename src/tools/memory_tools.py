@@ -10,11 +10,23 @@ from ..core import get_client
 logger = logging.getLogger(__name__)
 
 
+def memory_texts(memories: List[Dict[str, Any]]) -> List[Any]:
+    """Extract the memory text from each mem0 result"""
+    return [m.get("memory", m) for m in memories]
+
+
+def format_memories(memories: List[Dict[str, Any]]) -> str:
+    """Serialize mem0 results as a JSON list of memory texts"""
+    return json.dumps(memory_texts(memories))
+
+
 class MemoryTools:
     """Core memory tools for MCP server"""
     
-    def __init__(self):
-        self.client = get_client()
+    @property
+    def client(self):
+        """Shared mem0 client, looked up on each use so a client reset by close_client() is replaced"""
+        return get_client()
     
     async def add_memory(self, text: str) -> str:
         """
@@ -23,11 +35,14 @@ class MemoryTools:
         This tool stores any important information about yourself, your preferences,
         knowledge, or anything you want me to remember.
         """
+        if not text or not text.strip():
+            return "Nothing to add: memory text is empty"
+        
         try:
-            self.client.add_memory(text)
+            await self.client.aadd_memory(text)
             return f"Successfully added to memory: {text}"
         except Exception as e:
-            logger.error(f"Error adding memory: {e}")
+            logger.error("Error adding memory: %s", e)
             return f"Error adding to memory: {str(e)}"
     
     async def search_memories(self, query: str) -> str:
@@ -37,25 +52,34 @@ class MemoryTools:
         This tool searches for relevant information and context from your memories.
         """
         try:
-            memories = self.client.search_memories(query)
-            flattened = [m.get("memory", m) for m in memories]
-            return json.dumps(flattened, indent=2)
+            memories = await self.client.asearch_memories(query)
+            return format_memories(memories)
         except Exception as e:
-            logger.error(f"Error searching memories: {e}")
+            logger.error("Error searching memories: %s", e)
             return f"Error searching memories: {str(e)}"
     
-    async def get_all_memories(self) -> str:
+    async def get_all_memories(self, page: int = 1, page_size: int = 100) -> str:
         """
-        Get all stored memories for the user
+        Get stored memories for the user, one page at a time
         
-        Returns a comprehensive list of all stored information.
+        Returns a JSON object with the page of stored information under
+        "memories" and the page to request next under "next_page" (null on
+        the last page).
         """
+        page = max(page, 1)
+        page_size = max(1, min(page_size, 100))
+        
         try:
-            memories = self.client.get_all_memories()
-            flattened = [m.get("memory", m) for m in memories]
-            return json.dumps(flattened, indent=2)
+            response = await self.client.aget_memories_page(page=page, page_size=page_size)
+            memories = response.get("results", [])
+            
+            next_page = None
+            total = response.get("count")
+            if total is not None and total > (page - 1) * page_size + len(memories):
+                next_page = page + 1
+            return json.dumps({"memories": memory_texts(memories), "next_page": next_page})
         except Exception as e:
-            logger.error(f"Error getting memories: {e}")
+            logger.error("Error getting memories: %s", e)
             return f"Error getting memories: {str(e)}"
 
 
@@ -0,0 +1,47 @@
+"""
+Shared fixtures: a mem0 client wrapper backed by an in-memory fake MemoryClient
+"""
+import pytest
+
+from src.core import mem0_client
+
+
+class FakeMemoryClient:
+    """Stand-in for mem0's MemoryClient that keeps memories in a list"""
+    
+    def __init__(self, api_key=None, client=None):
+        self.api_key = api_key
+        self.memories = []
+        self.calls = []
+        # Called while a lookup is in flight, after its results were taken
+        self.during_lookup = None
+    
+    def add(self, messages, **params):
+        self.calls.append("add")
+        self.memories.append(messages[0]["content"])
+        return {"results": []}
+    
+    def search(self, query, **params):
+        self.calls.append("search")
+        return self._finish_lookup({"results": [{"memory": m} for m in self.memories]})
+    
+    def get_all(self, user_id, page, page_size):
+        self.calls.append("get_all")
+        start = (page - 1) * page_size
+        results = [{"memory": m} for m in self.memories[start:start + page_size]]
+        return self._finish_lookup({"results": results, "count": len(self.memories)})
+    
+    def _finish_lookup(self, response):
+        hook, self.during_lookup = self.during_lookup, None
+        if hook:
+            hook()
+        return response
+
+
+@pytest.fixture
+def wrapper(monkeypatch):
+    """Mem0ClientWrapper whose API calls go to a FakeMemoryClient"""
+    monkeypatch.setattr(mem0_client, "MemoryClient", FakeMemoryClient)
+    client = mem0_client.Mem0ClientWrapper(api_key="test-key")
+    yield client
+    client.close()
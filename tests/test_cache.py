@@ -0,0 +1,44 @@
+"""
+Tests for the TTL cache
+"""
+from types import SimpleNamespace
+
+from src.core import cache as cache_module
+from src.core.cache import TTLCache
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    cache = TTLCache(maxsize=4, ttl=10.0)
+    
+    cache.set("key", "value")
+    now[0] = 110.0
+    assert cache.get("key") == "value"
+    
+    now[0] = 110.5
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60.0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_clear_drops_all_entries():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.clear()
+    
+    assert cache.get("a") is None
+    assert len(cache) == 0
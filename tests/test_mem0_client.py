@@ -0,0 +1,151 @@
+"""
+Tests for the mem0 client wrapper
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.mem0_client import Mem0ClientWrapper
+
+
+def test_repeated_search_is_served_from_cache(wrapper):
+    wrapper.client.memories = ["a"]
+    
+    assert wrapper.search_memories("Some  Query") == [{"memory": "a"}]
+    assert wrapper.search_memories("some query") == [{"memory": "a"}]
+    assert wrapper.client.calls == ["search"]
+
+
+def test_write_invalidates_cached_search(wrapper):
+    wrapper.client.memories = ["a"]
+    wrapper.search_memories("x")
+    wrapper.add_memory("b")
+    
+    assert wrapper.search_memories("x") == [{"memory": "a"}, {"memory": "b"}]
+
+
+def test_search_racing_a_write_is_not_cached(wrapper):
+    wrapper.client.memories = ["a"]
+    wrapper.client.during_lookup = lambda: wrapper.add_memory("b")
+    
+    # The in-flight search still sees the memories from before the add...
+    assert wrapper.search_memories("x") == [{"memory": "a"}]
+    # ...but its results must not be served afterwards
+    assert wrapper.search_memories("x") == [{"memory": "a"}, {"memory": "b"}]
+
+
+def test_async_search_racing_a_write_is_not_cached(wrapper):
+    wrapper.client.memories = ["a"]
+    wrapper.client.during_lookup = lambda: wrapper.add_memory("b")
+    
+    assert asyncio.run(wrapper.asearch_memories("x")) == [{"memory": "a"}]
+    assert asyncio.run(wrapper.asearch_memories("x")) == [{"memory": "a"}, {"memory": "b"}]
+
+
+def test_page_fetch_racing_a_write_is_not_cached(wrapper):
+    wrapper.client.memories = ["a"]
+    wrapper.client.during_lookup = lambda: wrapper.add_memory("b")
+    
+    assert wrapper.get_memories_page()["count"] == 1
+    assert asyncio.run(wrapper.aget_memories_page())["count"] == 2
+
+
+class APIError(Exception):
+    """Shape of mem0 0.1.x errors: a bare message, raised while handling the HTTP error"""
+
+
+class StructuredError(Exception):
+    """Shape of mem0 1.x+ errors: the status is only kept in debug_info"""
+    
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.debug_info = {"status_code": status_code}
+
+
+def wrapped_http_error(status_code):
+    """An APIError whose context is the httpx error for the given status"""
+    request = httpx.Request("GET", "https://api.mem0.ai/v1/memories/")
+    response = httpx.Response(status_code, request=request)
+    try:
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError:
+            raise APIError("API request failed")
+    except APIError as e:
+        return e
+
+
+@pytest.mark.parametrize("status_code, retriable", [
+    (400, False),
+    (401, False),
+    (404, False),
+    (408, True),
+    (429, True),
+    (500, True),
+    (503, True),
+])
+def test_status_behind_mem0_errors_decides_retry(status_code, retriable):
+    for error in (wrapped_http_error(status_code), StructuredError(status_code)):
+        assert Mem0ClientWrapper._status_code(error) == status_code
+        assert Mem0ClientWrapper._is_retriable(error) is retriable
+
+
+def test_errors_without_status_are_retriable():
+    assert Mem0ClientWrapper._status_code(RuntimeError("connection reset")) is None
+    assert Mem0ClientWrapper._is_retriable(RuntimeError("connection reset"))
+    assert not Mem0ClientWrapper._is_retriable(ValueError("bad argument"))
+
+
+def failing(errors):
+    """Operation that raises the given errors in turn, then succeeds"""
+    calls = []
+    
+    def operation():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "done"
+    
+    return operation, calls
+
+
+def test_retry_recovers_from_transient_errors(wrapper):
+    operation, calls = failing([StructuredError(503), StructuredError(429)])
+    
+    assert wrapper.retry_operation(operation, max_retries=3, retry_delay=0) == "done"
+    assert len(calls) == 3
+
+
+def test_retry_stops_on_client_error(wrapper):
+    error = wrapped_http_error(401)
+    operation, calls = failing([error])
+    
+    with pytest.raises(APIError):
+        wrapper.retry_operation(operation, max_retries=3, retry_delay=0)
+    assert len(calls) == 1
+
+
+def test_retry_raises_last_error_when_attempts_run_out(wrapper):
+    errors = [StructuredError(500), StructuredError(502)]
+    operation, calls = failing(errors)
+    
+    with pytest.raises(StructuredError) as excinfo:
+        asyncio.run(wrapper.aretry_operation(operation, max_retries=2, retry_delay=0))
+    assert excinfo.value is errors[1]
+    assert len(calls) == 2
+
+
+def test_single_attempt_raises_the_error(wrapper):
+    operation, calls = failing([StructuredError(500)])
+    
+    with pytest.raises(StructuredError):
+        wrapper.retry_operation(operation, max_retries=1)
+    assert len(calls) == 1
+
+
+def test_backoff_delay_stays_within_bounds():
+    for attempt in range(6):
+        delay = Mem0ClientWrapper._backoff_delay(attempt, 1.0, 10.0)
+        backoff = min(10.0, 2 ** attempt)
+        assert backoff / 2 <= delay <= backoff
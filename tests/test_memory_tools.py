@@ -0,0 +1,56 @@
+"""
+Tests for the MCP memory tools
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.tools import memory_tools
+from src.tools.memory_tools import MemoryTools
+
+
+@pytest.fixture
+def tools(wrapper, monkeypatch):
+    """MemoryTools using the fake-backed client wrapper"""
+    monkeypatch.setattr(memory_tools, "get_client", lambda: wrapper)
+    wrapper.client.memories = ["m1", "m2", "m3", "m4", "m5"]
+    return MemoryTools()
+
+
+def get_page(tools, **kwargs):
+    return json.loads(asyncio.run(tools.get_all_memories(**kwargs)))
+
+
+@pytest.mark.parametrize("page, memories, next_page", [
+    (1, ["m1", "m2"], 2),
+    (2, ["m3", "m4"], 3),
+    (3, ["m5"], None),
+    (4, [], None),
+])
+def test_get_all_memories_pages(tools, page, memories, next_page):
+    assert get_page(tools, page=page, page_size=2) == {"memories": memories, "next_page": next_page}
+
+
+def test_get_all_memories_last_page_exactly_full(tools, wrapper):
+    wrapper.client.memories = ["m1", "m2", "m3", "m4"]
+    
+    assert get_page(tools, page=2, page_size=2)["next_page"] is None
+
+
+def test_get_all_memories_clamps_arguments(tools):
+    assert get_page(tools, page=0, page_size=500) == {
+        "memories": ["m1", "m2", "m3", "m4", "m5"],
+        "next_page": None,
+    }
+
+
+def test_get_all_memories_without_count_has_no_next_page(tools, wrapper, monkeypatch):
+    monkeypatch.setattr(wrapper.client, "get_all", lambda **kwargs: {"results": [{"memory": "m1"}]})
+    
+    assert get_page(tools, page_size=1) == {"memories": ["m1"], "next_page": None}
+
+
+def test_add_memory_rejects_blank_text(tools, wrapper):
+    assert asyncio.run(tools.add_memory("   ")) == "Nothing to add: memory text is empty"
+    assert wrapper.client.calls == []